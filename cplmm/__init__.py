@@ -10,7 +10,7 @@ from .models.cplmm import *                              # CPLMM fitting and slo
 
 # -------- Stats --------
 from .stats.wald_test import *                           # Wald test & p-values
-from .stats.mannwhitney import compare_groups_mannwhitney
+from .stats.mannwhitney import compare_groups_mannwhitney, pivot_expression_wide
 
 # -------- Survival --------
 from .survival.event_computation import compute_event_df
@@ -36,7 +36,7 @@ __all__ = [
     "fit_cplmm", "extract_slopes",  # (Assuming these are defined in cplmm.py)
 
     # Stats
-    "wald_test", "compare_groups_mannwhitney",
+    "wald_test", "compare_groups_mannwhitney", "pivot_expression_wide",
 
     # Survival
     "compute_event_df", "plot_km_with_threshold",
@@ -1,9 +1,134 @@
 import pandas as pd
 import numpy as np
-import statsmodels.formula.api as smf
+import patsy
+import statsmodels.api as sm
+from statsmodels.regression.mixed_linear_model import MixedLMParams
+from joblib import Parallel, delayed
 from sklearn.metrics import mean_squared_error
 from typing import List, Optional
 
+
+def _build_design(df, formula_rhs, subject_id_col):
+    """
+    Build the fixed-effects design matrix and group labels for one formula.
+
+    The design depends only on the right-hand side, so it is built once per group
+    and reused for every protein.
+    """
+    if df.empty:
+        return None
+
+    exog = patsy.dmatrix(formula_rhs, df, return_type="dataframe")
+    groups = df.loc[exog.index, subject_id_col].to_numpy()
+    return exog, groups
+
+
+def _ols_start_params(model):
+    """
+    Cheap MixedLM starting values from an OLS fit.
+
+    Fixed effects start at the OLS coefficients and the random-intercept variance
+    (relative to the residual scale) at the between-subject variance of the OLS
+    residuals.
+    """
+    ols = sm.OLS(model.endog, model.exog).fit()
+    group_means = pd.Series(ols.resid).groupby(model.groups).mean()
+    ratio = max(group_means.var() / ols.scale, 1e-3) if len(group_means) > 1 else 1.0
+    return MixedLMParams.from_components(fe_params=ols.params, cov_re=np.array([[ratio]]))
+
+
+def _fit_mixedlm(endog, exog, groups):
+    """
+    Fit a random-intercept MixedLM on prebuilt arrays.
+
+    Rows with a missing response are dropped from `endog`, `exog`, and `groups`
+    together. L-BFGS starts from OLS-based values with a capped iteration count;
+    fits that hit a singular random-effects covariance or do not converge fall
+    back to statsmodels' default optimizer sequence, and the better of the two
+    fits (converged first, then higher log-likelihood) is kept.
+    """
+    observed = ~np.isnan(endog)
+    if not observed.all():
+        endog, exog, groups = endog[observed], exog[observed], groups[observed]
+
+    model = sm.MixedLM(endog, exog, groups=groups)
+    try:
+        result = model.fit(reml=True, method="lbfgs", start_params=_ols_start_params(model), maxiter=100)
+    except np.linalg.LinAlgError:
+        return model.fit(reml=True)
+    if result.converged:
+        return result
+
+    fallback = model.fit(reml=True)
+    return max((result, fallback), key=lambda r: (r.converged, r.llf))
+
+
+def _fit_lmm_and_get_slopes(endog, design):
+    if design is None:
+        return np.nan, np.nan, None, np.nan, np.nan
+
+    exog, groups = design
+    result = _fit_mixedlm(endog, exog, groups)
+
+    fe = result.fe_params
+    bse = result.bse
+
+    slope_before = -fe.get("before_onset", np.nan)
+    slope_after = fe.get("after_onset", np.nan)
+    se_before = bse.get("before_onset", np.nan)
+    se_after = bse.get("after_onset", np.nan)
+
+    return slope_before, slope_after, result, se_before, se_after
+
+
+def _get_metrics(result):
+    if result is None:
+        return np.nan, np.nan, np.nan
+    aic = result.aic
+    bic = result.bic
+    y_true = result.model.endog
+    y_pred = result.predict(result.model.exog)
+    mse = mean_squared_error(y_true, y_pred)
+    return aic, bic, mse
+
+
+def _fit_one_protein(protein, endogs, designs):
+    """
+    Fit the status-change, normal, and abnormal models for a single protein.
+    """
+    design_status, design_normal, design_abnormal = designs
+    endog_status, endog_normal, endog_abnormal = endogs
+
+    s1, s3, r_status, se1, se3 = _fit_lmm_and_get_slopes(endog_status, design_status)
+    s2, _, r_normal, se2, _ = _fit_lmm_and_get_slopes(endog_normal, design_normal)
+    _, s4, r_abnormal, _, se4 = _fit_lmm_and_get_slopes(endog_abnormal, design_abnormal)
+
+    aic_s, bic_s, mse_s = _get_metrics(r_status)
+    aic_n, bic_n, mse_n = _get_metrics(r_normal)
+    aic_a, bic_a, mse_a = _get_metrics(r_abnormal)
+
+    return {
+        'Protein': protein,
+        'Beta 1': s1, 'SE Beta 1': se1,
+        'Beta 2': s2, 'SE Beta 2': se2,
+        'Beta 3': s3, 'SE Beta 3': se3,
+        'Beta 4': s4, 'SE Beta 4': se4,
+        'Intercept': r_status.fe_params.get("Intercept", np.nan) if r_status else np.nan,
+        'AIC Status': aic_s, 'BIC Status': bic_s, 'MSE Status': mse_s,
+        'AIC Normal': aic_n, 'BIC Normal': bic_n, 'MSE Normal': mse_n,
+        'AIC Abnormal': aic_a, 'BIC Abnormal': bic_a, 'MSE Abnormal': mse_a
+    }
+
+
+def _add_onset_terms(df, years_since_onset_col, cp=0):
+    # Fresh RangeIndex so design rows can be aligned back to the frame by label
+    df = df.reset_index(drop=True)
+    years = df[years_since_onset_col].to_numpy(dtype=float)
+    df['before_onset'] = np.maximum(0, cp - years)
+    df['after_onset'] = np.maximum(0, years - cp)
+    return df
+
+
 def fit_cplmm_all_proteins(
     df_status_change: pd.DataFrame,
     df_normal: pd.DataFrame,
@@ -11,73 +136,43 @@ def fit_cplmm_all_proteins(
     protein_list: List[str],
     covariates: List[str] = ["SEX", "BASELINE_AGE"],
     subject_id_col: str = "SUBID",
-    years_since_onset_col: str = "years_since_onset"
+    years_since_onset_col: str = "years_since_onset",
+    n_jobs: int = -1
 ) -> pd.DataFrame:
     """
     Fit change-point LMM across multiple proteins for status-change, normal, and abnormal groups.
-    
+
+    Proteins are fitted independently, so they are dispatched across `n_jobs` worker
+    processes (joblib convention: -1 uses all cores, 1 runs sequentially).
+
     Returns a dataframe with slopes, SEs, and model metrics.
     """
 
-    results = {}
-
-    def fit_lmm_and_get_slopes(df, formula, label):
-        if df.empty:
-            return np.nan, np.nan, None
-
-        df = df.copy()
-        cp = 0
-        df['before_onset'] = np.maximum(0, cp - df[years_since_onset_col])
-        df['after_onset'] = np.maximum(0, df[years_since_onset_col] - cp)
-
-        model = smf.mixedlm(formula, df, groups=df[subject_id_col])
-        result = model.fit()
-
-        fe = result.fe_params
-        bse = result.bse
-
-        slope_before = -fe.get("before_onset", np.nan)
-        slope_after = fe.get("after_onset", np.nan)
-        se_before = bse.get("before_onset", np.nan)
-        se_after = bse.get("after_onset", np.nan)
-
-        return slope_before, slope_after, result, se_before, se_after
-
-    for protein in protein_list:
-        formula_status = f"{protein} ~ before_onset + after_onset + {' + '.join(covariates)}"
-        formula_normal = f"{protein} ~ before_onset + {' + '.join(covariates)}"
-        formula_abnormal = f"{protein} ~ after_onset + {' + '.join(covariates)}"
-
-        s1, s3, r_status, se1, se3 = fit_lmm_and_get_slopes(df_status_change, formula_status, "Status Change")
-        s2, _, r_normal, se2, _ = fit_lmm_and_get_slopes(df_normal, formula_normal, "Normal")
-        _, s4, r_abnormal, _, se4 = fit_lmm_and_get_slopes(df_abnormal, formula_abnormal, "Abnormal")
-
-        def get_metrics(result, df, group_name):
-            if result is None:
-                return np.nan, np.nan, np.nan
-            aic = result.aic
-            bic = result.bic
-            y_true = df[protein]
-            y_pred = result.predict(df)
-            mse = mean_squared_error(y_true, y_pred)
-            return aic, bic, mse
-
-        aic_s, bic_s, mse_s = get_metrics(r_status, df_status_change, "status")
-        aic_n, bic_n, mse_n = get_metrics(r_normal, df_normal, "normal")
-        aic_a, bic_a, mse_a = get_metrics(r_abnormal, df_abnormal, "abnormal")
-
-        results[protein] = {
-            'Protein': protein,
-            'Beta 1': s1, 'SE Beta 1': se1,
-            'Beta 2': s2, 'SE Beta 2': se2,
-            'Beta 3': s3, 'SE Beta 3': se3,
-            'Beta 4': s4, 'SE Beta 4': se4,
-            'Intercept': r_status.fe_params.get("Intercept", np.nan) if r_status else np.nan,
-            'AIC Status': aic_s, 'BIC Status': bic_s, 'MSE Status': mse_s,
-            'AIC Normal': aic_n, 'BIC Normal': bic_n, 'MSE Normal': mse_n,
-            'AIC Abnormal': aic_a, 'BIC Abnormal': bic_a, 'MSE Abnormal': mse_a
-        }
-
-    df_results = pd.DataFrame.from_dict(results, orient='index')
+    # Change-point terms depend only on time since onset, so compute them once
+    df_status_change = _add_onset_terms(df_status_change, years_since_onset_col)
+    df_normal = _add_onset_terms(df_normal, years_since_onset_col)
+    df_abnormal = _add_onset_terms(df_abnormal, years_since_onset_col)
+
+    # Design matrices are shared by all proteins; only the response changes
+    covariate_terms = ' + '.join(covariates)
+    frames = (df_status_change, df_normal, df_abnormal)
+    designs = (
+        _build_design(df_status_change, f"before_onset + after_onset + {covariate_terms}", subject_id_col),
+        _build_design(df_normal, f"before_onset + {covariate_terms}", subject_id_col),
+        _build_design(df_abnormal, f"after_onset + {covariate_terms}", subject_id_col),
+    )
+
+    def endogs_for(protein):
+        return tuple(
+            None if design is None else df.loc[design[0].index, protein].to_numpy(dtype=float)
+            for df, design in zip(frames, designs)
+        )
+
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(_fit_one_protein)(protein, endogs_for(protein), designs)
+        for protein in protein_list
+    )
+
+    df_results = pd.DataFrame(results)
     df_results.reset_index(drop=True, inplace=True)
     return df_results
@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 
 def prepare_combined_expression(
     df_normal_only: pd.DataFrame,
@@ -42,35 +43,41 @@ def prepare_combined_expression(
     -------
     pd.DataFrame
         Long-format dataframe with columns: ['Gene', 'Expression', 'Source'].
+        `Gene` (ordered as `subset_genes`) and `Source` are categorical.
     """
 
-    def melt_subset(df, label):
-        melted = df[subset_genes].melt(var_name="Gene", value_name="Expression")
-        melted["Expression"] = pd.to_numeric(melted["Expression"], errors="coerce")
-        melted["Source"] = label
-        return melted
+    n_genes = len(subset_genes)
+    source_labels = list(dict.fromkeys(
+        [normal_label, status_label, abnormal_label] + [cat.replace(" ", "_") for cat in categories]
+    ))
+    gene_codes, expression, source_codes = [], [], []
+
+    def add_subset(df, label):
+        block = df[subset_genes]
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+            block = block.apply(pd.to_numeric, errors="coerce")
+        values = block.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # Column-major ravel matches melt's gene-by-gene row order
+        n_rows = values.shape[0]
+        gene_codes.append(np.repeat(np.arange(n_genes), n_rows))
+        expression.append(values.ravel(order="F"))
+        source_codes.append(np.full(values.size, source_labels.index(label), dtype=np.int16))
 
     # Core groups
-    melted_normal = melt_subset(df_normal_only, normal_label)
-    melted_status = melt_subset(df_status_change, status_label)
-    melted_abnormal = melt_subset(df_abnormal_only, abnormal_label)
+    add_subset(df_normal_only, normal_label)
+    add_subset(df_status_change, status_label)
+    add_subset(df_abnormal_only, abnormal_label)
 
     # Diagnostic categories
-    category_melted = []
     for cat in categories:
-        subset_df = df_all[df_all[category_col] == cat]
-        melted = subset_df[subset_genes].melt(var_name="Gene", value_name="Expression")
-        melted["Expression"] = pd.to_numeric(melted["Expression"], errors="coerce")
-        melted["Source"] = cat.replace(" ", "_")
-        category_melted.append(melted)
-
-    # Combine all
-    combined_expr = pd.concat(
-        [melted_normal, melted_status, melted_abnormal] + category_melted,
-        ignore_index=True
-    )
+        add_subset(df_all[df_all[category_col] == cat], cat.replace(" ", "_"))
 
-    # Order genes
-    combined_expr["Gene"] = pd.Categorical(combined_expr["Gene"], categories=subset_genes, ordered=True)
+    # Combine all, with genes ordered as given; categorical columns store small integer codes
+    combined_expr = pd.DataFrame({
+        "Gene": pd.Categorical.from_codes(np.concatenate(gene_codes), categories=subset_genes, ordered=True),
+        "Expression": np.concatenate(expression),
+        "Source": pd.Categorical.from_codes(np.concatenate(source_codes), categories=source_labels)
+    })
 
     return combined_expr
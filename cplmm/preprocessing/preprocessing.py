@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 
 def calculate_years_since_onset(df: pd.DataFrame,
                                  age_col: str = "age",
@@ -30,15 +31,13 @@ def set_onset_age_for_normals(df: pd.DataFrame,
     """
     For patients who remain 'Normal' across visits, set onset age to max age.
     """
-    normal_ids = (
-        df.groupby(subject_id_col)
-          .filter(lambda x: set(x[status_col]) == {'Normal'})[subject_id_col]
-          .unique()
+    # Rows without a subject ID belong to no subject and are left untouched
+    all_normal = (
+        (df[status_col] == 'Normal').groupby(df[subject_id_col]).transform('all')
+        .astype("boolean").fillna(False)
     )
-
-    for subid in normal_ids:
-        max_age = df.loc[df[subject_id_col] == subid, age_col].max()
-        df.loc[df[subject_id_col] == subid, mutated_col] = max_age
+    max_age = df.groupby(subject_id_col)[age_col].transform('max')
+    df.loc[all_normal, mutated_col] = max_age[all_normal]
 
     return df
 
@@ -50,8 +49,15 @@ def correct_status_by_onset(df: pd.DataFrame,
     """
     Fix logical inconsistencies based on onset age.
     """
-    df.loc[(df[onset_age_col] > df[age_col]) & (df[status_col] == 'Abnormal'), status_col] = 'Normal'
-    df.loc[(df[onset_age_col] < df[age_col]) & (df[status_col] == 'Normal'), status_col] = 'Abnormal'
+    age = df[age_col].to_numpy(dtype=float)
+    onset = df[onset_age_col].to_numpy(dtype=float)
+    status = df[status_col]
+    is_abnormal = status.eq('Abnormal').to_numpy(dtype=bool, na_value=False)
+    is_normal = status.eq('Normal').to_numpy(dtype=bool, na_value=False)
+    corrected = np.where((onset > age) & is_abnormal, 'Normal',
+                         np.where((onset < age) & is_normal, 'Abnormal', status.to_numpy(dtype=object)))
+    # np.where yields an object array; restore the column's dtype (e.g. categorical)
+    df[status_col] = pd.Series(corrected, index=df.index).astype(df[status_col].dtype)
     return df
 
 
@@ -64,16 +70,13 @@ def enforce_unidirectional_status_change(df: pd.DataFrame,
     """
     df = df.sort_values(by=[subject_id_col, date_col])
 
-    def correct_status(sub_df):
-        abnormal_seen = False
-        for idx, row in sub_df.iterrows():
-            if row[status_col] == "Abnormal":
-                abnormal_seen = True
-            if abnormal_seen:
-                sub_df.at[idx, status_col] = "Abnormal"
-        return sub_df
+    # Running max of the abnormal indicator marks every visit from the first abnormal one on;
+    # rows without a subject ID get NaN from the grouped cummax and are left as they are
+    is_abnormal = (df[status_col] == "Abnormal").astype(np.int8)
+    abnormal_seen = is_abnormal.groupby(df[subject_id_col]).cummax().fillna(0).astype(bool)
+    df.loc[abnormal_seen, status_col] = "Abnormal"
 
-    return df.groupby(subject_id_col, group_keys=False).apply(correct_status)
+    return df
 
 
 def identify_status_change_subjects(df: pd.DataFrame,
@@ -84,9 +87,12 @@ def identify_status_change_subjects(df: pd.DataFrame,
     Return only subjects that changed from Normal to Abnormal.
     """
     df_sorted = df.sort_values(by=[subject_id_col, date_col])
-    return df_sorted.groupby(subject_id_col).filter(
-        lambda x: (x[status_col] == "Normal").any() and (x[status_col] != "Normal").any()
-    )
+    is_normal = df_sorted[status_col] == "Normal"
+    by_subject = df_sorted[subject_id_col]
+    # Rows without a subject ID get NaN from the grouped transforms and are excluded
+    has_normal = is_normal.groupby(by_subject).transform("any").astype("boolean").fillna(False)
+    has_abnormal = (~is_normal).groupby(by_subject).transform("any").astype("boolean").fillna(False)
+    return df_sorted[has_normal & has_abnormal]
 
 
 def get_status_groups(df: pd.DataFrame,
@@ -95,10 +101,12 @@ def get_status_groups(df: pd.DataFrame,
     """
     Return normal-only and abnormal-only groups.
     """
-    normal_ids = df.groupby(subject_id_col)[status_col].apply(lambda x: (x == "Normal").all())
-    abnormal_ids = df.groupby(subject_id_col)[status_col].apply(lambda x: (x != "Normal").all())
+    is_normal = df[status_col] == "Normal"
+    # Rows without a subject ID get NaN from the grouped transforms and belong to neither group
+    all_normal = is_normal.groupby(df[subject_id_col]).transform("all").astype("boolean").fillna(False)
+    all_abnormal = (~is_normal).groupby(df[subject_id_col]).transform("all").astype("boolean").fillna(False)
 
-    df_normal = df[df[subject_id_col].isin(normal_ids[normal_ids].index)]
-    df_abnormal = df[df[subject_id_col].isin(abnormal_ids[abnormal_ids].index)]
+    df_normal = df[all_normal]
+    df_abnormal = df[all_abnormal]
 
     return df_normal, df_abnormal
@@ -1,2 +1,2 @@
 from .wald_test import *
-from .mannwhitney import compare_groups_mannwhitney
\ No newline at end of file
+from .mannwhitney import compare_groups_mannwhitney, pivot_expression_wide
\ No newline at end of file
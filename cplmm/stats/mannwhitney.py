@@ -1,6 +1,56 @@
 from scipy.stats import mannwhitneyu
 from statsmodels.stats.multitest import multipletests
 import pandas as pd
+import numpy as np
+
+def _mannwhitney_rows(samples1: np.ndarray, samples2: np.ndarray):
+    """
+    Two-sided Mann-Whitney U test for each row of two NaN-padded sample matrices.
+
+    scipy's automatic choice between the exact and asymptotic test depends on the
+    sample sizes and on ties, so rows are tested in buckets sharing (n1, n2, ties);
+    each bucket gets the same method a per-row call would.
+    """
+    n1 = np.count_nonzero(~np.isnan(samples1), axis=1)
+    n2 = np.count_nonzero(~np.isnan(samples2), axis=1)
+
+    # Sorting moves the NaN padding to the end of each row
+    sorted1 = np.sort(samples1, axis=1)
+    sorted2 = np.sort(samples2, axis=1)
+    pooled = np.sort(np.hstack([samples1, samples2]), axis=1)
+    ties = (np.diff(pooled, axis=1) == 0).any(axis=1)
+
+    stat = np.empty(len(n1))
+    p = np.empty(len(n1))
+    buckets, bucket_of_row = np.unique(np.column_stack([n1, n2, ties]), axis=0, return_inverse=True)
+    for b, (size1, size2, _) in enumerate(buckets):
+        rows = np.flatnonzero(bucket_of_row == b)
+        stat[rows], p[rows] = mannwhitneyu(
+            sorted1[rows, :size1], sorted2[rows, :size2], axis=1, alternative="two-sided"
+        )
+    return stat, p
+
+
+def pivot_expression_wide(combined_expr: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pivot a long-format expression dataframe to a wide (sample x gene) table.
+
+    Parameters
+    ----------
+    combined_expr : pd.DataFrame
+        Long-format expression dataframe (columns: Gene, Expression, Source).
+
+    Returns
+    -------
+    pd.DataFrame
+        Expression values with one column per gene and a (Source, sample_idx) row index,
+        suitable as `wide_cache` for `compare_groups_mannwhitney`.
+    """
+    sample_idx = combined_expr.groupby(["Gene", "Source"], observed=True).cumcount()
+    return combined_expr.assign(sample_idx=sample_idx).pivot(
+        index=["Source", "sample_idx"], columns="Gene", values="Expression"
+    )
+
 
 def compare_groups_mannwhitney(
     combined_expr: pd.DataFrame,
@@ -8,7 +58,8 @@ def compare_groups_mannwhitney(
     group1: str,
     group2: str,
     alpha: float = 0.05,
-    rank_by: str = "FDR"
+    rank_by: str = "FDR",
+    wide_cache: pd.DataFrame = None
 ) -> pd.DataFrame:
     """
     Perform Mann-Whitney U test to compare expression between two groups for a set of genes.
@@ -27,6 +78,9 @@ def compare_groups_mannwhitney(
         Significance threshold (for marking significance after FDR correction).
     rank_by : str
         Column to sort results by ("FDR", "p_value", or "Delta_mean").
+    wide_cache : pd.DataFrame
+        Optional output of `pivot_expression_wide(combined_expr)`. When comparing several
+        group pairs, build it once and pass it to each call to skip the long-format scan.
 
     Returns
     -------
@@ -40,26 +94,54 @@ def compare_groups_mannwhitney(
         - FDR (adjusted p-value)
         - Significant (boolean flag based on FDR < alpha)
     """
-    results = []
-
-    for gene in gene_list:
-        expr1 = combined_expr[(combined_expr["Gene"] == gene) & (combined_expr["Source"] == group1)]["Expression"].dropna()
-        expr2 = combined_expr[(combined_expr["Gene"] == gene) & (combined_expr["Source"] == group2)]["Expression"].dropna()
-
-        if len(expr1) > 0 and len(expr2) > 0:
-            stat, p = mannwhitneyu(expr1, expr2, alternative="two-sided")
-            delta = expr2.mean() - expr1.mean()
-
-            results.append({
-                "Gene": gene,
-                f"{group1}_mean": expr1.mean(),
-                f"{group2}_mean": expr2.mean(),
-                "Delta_mean": delta,
-                "U_statistic": stat,
-                "p_value": p
-            })
-
-    results_df = pd.DataFrame(results)
+    if wide_cache is not None:
+        # Each group's samples are rows of the cached wide table
+        sources = wide_cache.index.get_level_values("Source")
+        block1 = wide_cache[sources == group1]
+        block2 = wide_cache[sources == group2]
+        tested = [
+            gene for gene in gene_list
+            if gene in wide_cache.columns and block1[gene].notna().any() and block2[gene].notna().any()
+        ]
+        samples1 = block1[tested].to_numpy(dtype=float).T
+        samples2 = block2[tested].to_numpy(dtype=float).T
+    else:
+        # Index the two groups once instead of masking the full table per gene
+        valid = combined_expr[
+            combined_expr["Source"].isin([group1, group2]) & combined_expr["Gene"].isin(gene_list)
+        ].dropna(subset=["Expression"])
+        grouped = valid.groupby(["Gene", "Source"], observed=True)["Expression"]
+        values = valid["Expression"].to_numpy()
+        positions = grouped.indices
+
+        tested = [gene for gene in gene_list if (gene, group1) in positions and (gene, group2) in positions]
+
+        def padded_samples(group):
+            # One row per gene, NaN-padded to the largest sample size
+            samples = [values[positions[(gene, group)]] for gene in tested]
+            matrix = np.full((len(samples), max(map(len, samples), default=0)), np.nan)
+            for i, sample in enumerate(samples):
+                matrix[i, :len(sample)] = sample
+            return matrix
+
+        samples1 = padded_samples(group1)
+        samples2 = padded_samples(group2)
+
+    if tested:
+        stat, p = _mannwhitney_rows(samples1, samples2)
+        mean1 = np.nanmean(samples1, axis=1)
+        mean2 = np.nanmean(samples2, axis=1)
+    else:
+        stat = p = mean1 = mean2 = np.array([], dtype=float)
+
+    results_df = pd.DataFrame({
+        "Gene": tested,
+        f"{group1}_mean": mean1,
+        f"{group2}_mean": mean2,
+        "Delta_mean": mean2 - mean1,
+        "U_statistic": stat,
+        "p_value": p
+    })
 
     # FDR correction
     results_df["FDR"] = multipletests(results_df["p_value"], method="fdr_bh")[1]
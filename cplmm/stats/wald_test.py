@@ -28,43 +28,49 @@ def compute_wald_test(
     pd.DataFrame
         Wald test results including p-values, FDR-adjusted p-values, significance flags, and ranking.
     """
-    wald_results = []
+    def column(name):
+        if name in results_df.columns:
+            return results_df[name].to_numpy(dtype=float)
+        return np.full(len(results_df), np.nan)
 
-    for _, row in results_df.iterrows():
-        # Extract betas and SEs
-        beta_1, se_beta_1 = row.get('Beta 1', np.nan), row.get('SE Beta 1', np.nan)
-        beta_3, se_beta_3 = row.get('Beta 3', np.nan), row.get('SE Beta 3', np.nan)
-        beta_2, se_beta_2 = row.get('Beta 2', np.nan), row.get('SE Beta 2', np.nan)
-        beta_4, se_beta_4 = row.get('Beta 4', np.nan), row.get('SE Beta 4', np.nan)
+    # Extract betas and SEs
+    beta_1, se_beta_1 = column('Beta 1'), column('SE Beta 1')
+    beta_3, se_beta_3 = column('Beta 3'), column('SE Beta 3')
+    beta_2, se_beta_2 = column('Beta 2'), column('SE Beta 2')
+    beta_4, se_beta_4 = column('Beta 4'), column('SE Beta 4')
 
-        # Skip if missing
-        if any(pd.isna([beta_1, se_beta_1, beta_3, se_beta_3, beta_2, se_beta_2, beta_4, se_beta_4])):
-            continue
+    # Skip if missing
+    complete = ~np.isnan(np.column_stack([
+        beta_1, se_beta_1, beta_3, se_beta_3, beta_2, se_beta_2, beta_4, se_beta_4
+    ])).any(axis=1)
 
-        # Wald statistics
+    # Wald statistics
+    with np.errstate(divide="ignore", invalid="ignore"):
         wald_stat_1 = ((beta_1 - beta_3) ** 2) / (se_beta_1 ** 2 + se_beta_3 ** 2)
         wald_stat_2 = ((beta_2 - beta_4) ** 2) / (se_beta_2 ** 2 + se_beta_4 ** 2)
 
-        # p-values
-        p_val_1 = 1 - chi2.cdf(wald_stat_1, df=1)
-        p_val_2 = 1 - chi2.cdf(wald_stat_2, df=1)
+    # p-values (survival function keeps precision in the far tail)
+    p_val_1 = chi2.sf(wald_stat_1, df=1)
+    p_val_2 = chi2.sf(wald_stat_2, df=1)
 
-        wald_results.append({
-            "Protein": row["Protein"],
-            "Beta 1": beta_1, "SE Beta 1": se_beta_1,
-            "Beta 3": beta_3, "SE Beta 3": se_beta_3,
-            "Wald Statistic 1": wald_stat_1, "P-value 1": p_val_1,
-            "Beta 2": beta_2, "SE Beta 2": se_beta_2,
-            "Beta 4": beta_4, "SE Beta 4": se_beta_4,
-            "Wald Statistic 2": wald_stat_2, "P-value 2": p_val_2
-        })
+    wald_df = pd.DataFrame({
+        "Protein": results_df["Protein"].to_numpy(),
+        "Beta 1": beta_1, "SE Beta 1": se_beta_1,
+        "Beta 3": beta_3, "SE Beta 3": se_beta_3,
+        "Wald Statistic 1": wald_stat_1, "P-value 1": p_val_1,
+        "Beta 2": beta_2, "SE Beta 2": se_beta_2,
+        "Beta 4": beta_4, "SE Beta 4": se_beta_4,
+        "Wald Statistic 2": wald_stat_2, "P-value 2": p_val_2
+    })[complete].reset_index(drop=True)
 
-    wald_df = pd.DataFrame(wald_results)
-
-    # FDR adjustment
+    # FDR adjustment, each p-value column as its own family; undefined p-values stay NaN
     if adjust_p:
         for i in [1, 2]:
-            rejected, p_adj, _, _ = multipletests(wald_df[f"P-value {i}"], method="fdr_bh")
+            p_val = wald_df[f"P-value {i}"].to_numpy()
+            tested = ~np.isnan(p_val)
+            p_adj = np.full(len(p_val), np.nan)
+            if tested.any():
+                p_adj[tested] = multipletests(p_val[tested], method="fdr_bh")[1]
             wald_df[f"Adjusted P-value {i}"] = p_adj
             wald_df[f"Significant {i}"] = p_adj < alpha
 
@@ -22,16 +22,23 @@ def compute_event_df(df, threshold, biomarker, group_label, onset_source='ONSET_
     pd.DataFrame
         Event dataframe with columns: SUBID, time (years since onset), event (0/1), group.
     """
-    event_data = []
-    for subid, g in df.groupby("SUBID"):
-        g = g.sort_values("PROCEDURE_AGE")
-        onset_age = g[onset_source].iloc[0]
-        crossed = g[g[biomarker] >= threshold]
-        if not crossed.empty:
-            time = crossed["PROCEDURE_AGE"].iloc[0] - onset_age
-            event = 1
-        else:
-            time = g["PROCEDURE_AGE"].max() - onset_age
-            event = 0
-        event_data.append({"SUBID": subid, "time": time, "event": event, "group": group_label})
-    return pd.DataFrame(event_data)
+    subids = df["SUBID"].to_numpy()
+    ages = df["PROCEDURE_AGE"].reset_index(drop=True)
+    by_subject = ages.groupby(subids)
+
+    # Onset is taken from each subject's earliest visit; min/max need no sort
+    first_visit = by_subject.idxmin()
+    onset_age = pd.Series(df[onset_source].to_numpy()[first_visit.to_numpy()], index=first_visit.index)
+    max_age = by_subject.max()
+    crossed = (df[biomarker] >= threshold).to_numpy()
+    first_cross_age = ages[crossed].groupby(subids[crossed]).min().reindex(onset_age.index)
+
+    event = first_cross_age.notna()
+    time = first_cross_age.where(event, max_age) - onset_age
+
+    return pd.DataFrame({
+        "SUBID": onset_age.index.to_numpy(),
+        "time": time.to_numpy(),
+        "event": event.astype(int).to_numpy(),
+        "group": group_label
+    })
@@ -1,5 +1,6 @@
 import os
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from lifelines import KaplanMeierFitter
 from lifelines.statistics import logrank_test
@@ -15,7 +16,9 @@ def plot_km_with_threshold(
     save=False,
     save_path="Figures",
     jama_palette=None,
-    time_points=np.arange(-10, 6, 2)
+    time_points=np.arange(-10, 6, 2),
+    ci_show=True,
+    show=True
 ):
     """
     Plot Kaplan-Meier curves for biomarker threshold crossing, including log-rank test and at-risk table.
@@ -42,6 +45,10 @@ def plot_km_with_threshold(
         Optional custom color palette for groups.
     time_points : array-like
         Time points for plotting and at-risk table.
+    ci_show : bool
+        Whether to shade the confidence interval around each curve.
+    show : bool
+        Whether to display the figure; when False it is closed instead.
     """
     # Extract MCI subgroup from status-change patients
     mci_subids = wd_df.loc[wd_df["CATEGORY"] == "MCI", "SUBID"].unique()
@@ -51,7 +58,9 @@ def plot_km_with_threshold(
     event_df_normal = compute_event_df(normal_df, threshold, biomarker_name, "Normal")
     event_df_mci = compute_event_df(mci_df, threshold, biomarker_name, "MCI")
     event_df_statuschange = compute_event_df(wd_df, threshold, biomarker_name, "Status-Change")
-    event_df = pd.concat([event_df_statuschange, event_df_normal, event_df_mci], ignore_index=True)
+    event_df = pd.concat([event_df_statuschange, event_df_normal, event_df_mci], ignore_index=True, sort=False)
+    # Categories follow the existing legend and at-risk table order
+    event_df["group"] = pd.Categorical(event_df["group"], categories=["MCI", "Normal", "Status-Change"])
 
     # Default palette
     if jama_palette is None:
@@ -59,18 +68,27 @@ def plot_km_with_threshold(
 
     # Fit KM curves
     fig, ax = plt.subplots(figsize=(6, 8), dpi=300)
-    kmf_dict, at_risk_dict = {}, {}
-    for label, group_df in event_df.groupby("group"):
-        kmf = KaplanMeierFitter()
+    kmf, at_risk_dict = KaplanMeierFitter(), {}
+    for label, group_df in event_df.groupby("group", observed=True):
         kmf.fit(group_df["time"], group_df["event"], label=label)
-        kmf.plot_survival_function(ax=ax, ci_show=True, linewidth=1.5, color=jama_palette.get(label, 'black'))
-        kmf_dict[label] = kmf
-        at_risk_dict[label] = [
-            kmf.event_table.loc[kmf.event_table.index >= t, 'at_risk'].iloc[0] if any(kmf.event_table.index >= t) else 0
-            for t in time_points
-        ]
+        color = jama_palette.get(label, 'black')
+
+        # Draw the step curve (and CI band) straight from the fitted arrays
+        timeline = kmf.survival_function_.index.to_numpy(dtype=float)
+        ax.step(timeline, kmf.survival_function_.iloc[:, 0].to_numpy(), where='post',
+                color=color, linewidth=1.5, label=label)
+        if ci_show:
+            ci = kmf.confidence_interval_.to_numpy()
+            ax.fill_between(timeline, ci[:, 0], ci[:, 1], step='post', alpha=0.3, color=color, linewidth=1.0)
+
+        # At-risk count at the first event-table time >= t (0 past the last time)
+        event_times = kmf.event_table.index.to_numpy()
+        at_risk = kmf.event_table['at_risk'].to_numpy()
+        pos = np.searchsorted(event_times, time_points, side='left')
+        at_risk_dict[label] = np.where(pos < len(event_times), at_risk[np.minimum(pos, len(event_times) - 1)], 0)
 
     # Plot labels and axis
+    ax.legend()
     ax.axvline(0, linestyle='--', color='gray', linewidth=1)
     ax.set_title(f"{biomarker_name} ≥ {threshold:.2f}", fontsize=20)
     ax.set_xlabel("Years to Onset", fontsize=20)
@@ -104,4 +122,7 @@ def plot_km_with_threshold(
         os.makedirs(save_path, exist_ok=True)
         fig.savefig(os.path.join(save_path, f"KM_{biomarker_name}_JAMA.svg"), format="svg", bbox_inches="tight")
 
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
@@ -2,7 +2,8 @@ import pandas as pd
 import numpy as np
 import os
 import matplotlib.pyplot as plt
-import statsmodels.formula.api as smf
+import patsy
+from ..models.cplmm import _add_onset_terms, _fit_mixedlm
 
 def plot_cplmm(
     df_status_change: pd.DataFrame,
@@ -17,7 +18,8 @@ def plot_cplmm(
     style_config: dict = None,
     export: bool = False,
     export_dir: str = "Figures",
-    export_formats: list = ["pdf", "svg"]
+    export_formats: list = ["pdf", "svg"],
+    show: bool = True
 ):
     """
     Plot change-point LMM trajectories for protein expression across patient groups.
@@ -50,11 +52,10 @@ def plot_cplmm(
         Directory to save figures to.
     export_formats : list
         List of formats to export (e.g. ["pdf", "svg"]).
+    show : bool
+        Whether to display the figure; when False it is closed instead.
     """
 
-    if style_config:
-        plt.rcParams.update(style_config)
-
     # Defaults
     group_colors = group_colors or {
         'status_change': '#DF8F44',
@@ -68,6 +69,11 @@ def plot_cplmm(
         'abnormal': 'Abnormal'
     }
 
+    # Change-point terms are computed once per group, ahead of the fits
+    df_status_change = _add_onset_terms(df_status_change, years_since_onset_col)
+    df_normal = _add_onset_terms(df_normal, years_since_onset_col)
+    df_abnormal = _add_onset_terms(df_abnormal, years_since_onset_col)
+
     mean_covariates = {
         cov: df_status_change[cov].mean() for cov in covariates if cov in df_status_change.columns
     }
@@ -76,20 +82,16 @@ def plot_cplmm(
         if df.empty:
             return
 
-        df = df.copy()
-        change_point = 0
-
-        df["before_onset"] = np.maximum(0, change_point - df[years_since_onset_col])
-        df["after_onset"] = np.maximum(0, df[years_since_onset_col] - change_point)
-
-        formula = f"{protein} ~ {formula_rhs}"
-        model = smf.mixedlm(formula, df, groups=df[subject_id_col])
-        result = model.fit()
+        exog = patsy.dmatrix(formula_rhs, df, return_type="dataframe")
+        df = df.loc[exog.index]
+        result = _fit_mixedlm(df[protein].to_numpy(dtype=float), exog, df[subject_id_col].to_numpy())
 
+        # Rebuild the design at mean covariates from the cached design info
         df_pred = df.copy()
         for cov in covariates:
             df_pred[cov] = mean_covariates[cov]
-        df_pred["global_prediction"] = result.predict(df_pred)
+        (exog_pred,) = patsy.build_design_matrices([exog.design_info], df_pred, return_type="dataframe")
+        df_pred["global_prediction"] = result.predict(exog_pred)
 
         global_trend = df_pred.groupby(years_since_onset_col)["global_prediction"].mean()
 
@@ -100,49 +102,53 @@ def plot_cplmm(
                  linewidth=2.5)
 
     # Plotting
-    plt.figure(figsize=(6, 4), dpi=300)
-
-    # Fit models
-    fit_and_plot(df_status_change,
-                 "before_onset + after_onset + " + " + ".join(covariates),
-                 "status_change")
-
-    fit_and_plot(df_normal,
-                 "before_onset + " + " + ".join(covariates),
-                 "normal")
-
-    fit_and_plot(df_abnormal,
-                 "after_onset + " + " + ".join(covariates),
-                 "abnormal")
-
-    plt.axvline(x=0, color="black", linestyle="--", linewidth=1.5, label="Onset")
-
-    plt.xlabel("Years Since Onset")
-    plt.ylabel(f"{protein} Expression")
-    plt.title(f"{protein} Trajectory Aligned to Onset")
-
-    ax = plt.gca()
-    for spine in ax.spines.values():
-        spine.set_linewidth(1)
-        spine.set_color("black")
-
-    # Dynamic ticks
-    all_x = pd.concat([
-        df_status_change[years_since_onset_col],
-        df_normal[years_since_onset_col],
-        df_abnormal[years_since_onset_col]
-    ])
-    min_x = int(np.floor(all_x.min() / 5) * 5)
-    max_x = int(np.ceil(all_x.max() / 5) * 5)
-    plt.xticks(np.arange(min_x, max_x + 1, 5))
-
-    plt.legend(bbox_to_anchor=(1.02, 1), loc="upper left", frameon=True)
-    plt.tight_layout()
-
-    if export:
-        os.makedirs(export_dir, exist_ok=True)
-        for fmt in export_formats:
-            plt.savefig(os.path.join(export_dir, f"{protein}_cplmm.{fmt}"),
-                        format=fmt, bbox_inches="tight")
-
-    plt.show()
+    with plt.rc_context(style_config):
+        fig = plt.figure(figsize=(6, 4), dpi=300)
+
+        # Fit models
+        fit_and_plot(df_status_change,
+                     "before_onset + after_onset + " + " + ".join(covariates),
+                     "status_change")
+
+        fit_and_plot(df_normal,
+                     "before_onset + " + " + ".join(covariates),
+                     "normal")
+
+        fit_and_plot(df_abnormal,
+                     "after_onset + " + " + ".join(covariates),
+                     "abnormal")
+
+        plt.axvline(x=0, color="black", linestyle="--", linewidth=1.5, label="Onset")
+
+        plt.xlabel("Years Since Onset")
+        plt.ylabel(f"{protein} Expression")
+        plt.title(f"{protein} Trajectory Aligned to Onset")
+
+        ax = plt.gca()
+        for spine in ax.spines.values():
+            spine.set_linewidth(1)
+            spine.set_color("black")
+
+        # Dynamic ticks
+        all_x = pd.concat([
+            df_status_change[years_since_onset_col],
+            df_normal[years_since_onset_col],
+            df_abnormal[years_since_onset_col]
+        ])
+        min_x = int(np.floor(all_x.min() / 5) * 5)
+        max_x = int(np.ceil(all_x.max() / 5) * 5)
+        plt.xticks(np.arange(min_x, max_x + 1, 5))
+
+        plt.legend(bbox_to_anchor=(1.02, 1), loc="upper left", frameon=True)
+        plt.tight_layout()
+
+        if export:
+            os.makedirs(export_dir, exist_ok=True)
+            for fmt in export_formats:
+                plt.savefig(os.path.join(export_dir, f"{protein}_cplmm.{fmt}"),
+                            format=fmt, bbox_inches="tight")
+
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
@@ -1,7 +1,58 @@
+import colorsys
+import matplotlib.colors as mcolors
+import matplotlib.patches as patches
 import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+import pandas as pd
 import os
 
+_DEFAULT_RC = {
+    "font.family": "serif",
+    "font.serif": ["Times New Roman", "Times", "DejaVu Serif"],
+    "font.size": 20,
+    "axes.labelsize": 20,
+    "axes.titlesize": 22,
+    "xtick.labelsize": 18,
+    "ytick.labelsize": 18,
+    "legend.fontsize": 18,
+    "axes.linewidth": 1.5,
+    "pdf.fonttype": 42
+}
+
+
+def _box_stats(values, keys, whis=1.5):
+    """
+    Tukey box statistics for every group of `values`, in sorted key order.
+
+    Quartiles come from one grouped quantile call and whiskers/fliers from
+    grouped min/max over masked values, following matplotlib's `boxplot_stats`
+    (whiskers end at the most extreme data points within `whis` * IQR).
+    """
+    grouped = values.groupby(keys, observed=True)
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    q1, med, q3 = (quartiles[q].to_numpy() for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+
+    x = values.to_numpy()
+    group_id = grouped.ngroup().to_numpy()
+    within_lo = np.where(x >= (q1 - whis * iqr)[group_id], x, np.nan)
+    within_hi = np.where(x <= (q3 + whis * iqr)[group_id], x, np.nan)
+    whislo = np.fmin(pd.Series(within_lo).groupby(group_id).min().to_numpy(), q1)
+    whishi = np.fmax(pd.Series(within_hi).groupby(group_id).max().to_numpy(), q3)
+
+    is_flier = (x < whislo[group_id]) | (x > whishi[group_id])
+    flier_groups = group_id[is_flier]
+    order = np.argsort(flier_groups, kind="stable")
+    counts = np.bincount(flier_groups, minlength=len(q1))
+    fliers = np.split(x[is_flier][order], np.cumsum(counts)[:-1])
+
+    stats = pd.DataFrame(
+        {"q1": q1, "med": med, "q3": q3, "whislo": whislo, "whishi": whishi, "fliers": fliers},
+        index=quartiles.index
+    )
+    return stats
+
+
 def plot_expression_boxplot(
     combined_expr,
     gene_order,
@@ -16,7 +67,8 @@ def plot_expression_boxplot(
     export=False,
     export_dir="Figures",
     export_name="gene_expression_boxplot",
-    export_formats=["pdf", "svg"]
+    export_formats=["pdf", "svg"],
+    show=True
 ):
     """
     Plot expression of genes across diagnostic categories as boxplots.
@@ -34,7 +86,8 @@ def plot_expression_boxplot(
     gene_col : str
         Column containing gene names.
     palette : dict
-        Color palette mapping categories to colors.
+        Color palette mapping categories to colors. Categories are drawn in the
+        palette's order; categories missing from it are not drawn.
     title : str
         Plot title.
     y_limit : float or None
@@ -51,10 +104,9 @@ def plot_expression_boxplot(
         Base filename for exported plots.
     export_formats : list
         Formats for export (e.g., pdf, svg, png).
+    show : bool
+        Whether to display the figure; when False it is closed instead.
     """
-    # Ensure gene order is categorical
-    combined_expr[gene_col] = pd.Categorical(combined_expr[gene_col], categories=gene_order, ordered=True)
-
     # Default JAMA palette if not provided
     if palette is None:
         palette = {
@@ -66,66 +118,93 @@ def plot_expression_boxplot(
         }
 
     # Set style
-    plt.rcParams.update({
-        "font.family": "serif",
-        "font.serif": ["Times New Roman", "Times", "DejaVu Serif"],
-        "font.size": 20,
-        "axes.labelsize": 20,
-        "axes.titlesize": 22,
-        "xtick.labelsize": 18,
-        "ytick.labelsize": 18,
-        "legend.fontsize": 18,
-        "axes.linewidth": 1.5,
-        "pdf.fonttype": 42
-    })
-
-    # Flier properties (outliers)
-    flier_props = dict(
-        marker="o", markerfacecolor="white",
-        markeredgecolor="black", markersize=2,
-        markeredgewidth=0.5, linestyle="none"
-    )
+    with plt.rc_context(_DEFAULT_RC):
+        # Flier properties (outliers)
+        flier_props = dict(
+            marker="o", markerfacecolor="white",
+            markeredgecolor="black", markersize=2,
+            markeredgewidth=0.5, linestyle="none"
+        )
 
-    # Plot
-    fig, ax = plt.subplots(figsize=figsize, dpi=300)
-    sns.boxplot(
-        data=combined_expr,
-        x=gene_col,
-        y=expression_col,
-        hue=hue_col,
-        palette=palette,
-        linewidth=0.8,
-        width=0.9,
-        flierprops=flier_props,
-        ax=ax
-    )
+        # Box statistics for every (gene, category) pair, computed once; the input
+        # frame is left untouched and genes are placed by their index in gene_order
+        gene_pos = pd.Index(gene_order).get_indexer(combined_expr[gene_col])
+        hue_values = combined_expr[hue_col]
+        plotted = (gene_pos >= 0) & combined_expr[expression_col].notna().to_numpy()
+        present = set(hue_values[plotted].dropna().unique())
+        hue_levels = [level for level in palette if level in present]
+        if not hue_levels:
+            raise ValueError(
+                f"No '{hue_col}' category in the palette has expression values for the genes in gene_order."
+            )
+        keep = plotted & hue_values.isin(hue_levels).to_numpy()
+        stats = _box_stats(combined_expr[expression_col][keep], [gene_pos[keep], hue_values.to_numpy()[keep]])
+
+        # Seaborn-style muted fills and a shared dark-gray line color
+        colors = {}
+        for level in hue_levels:
+            h, l, s = colorsys.rgb_to_hls(*mcolors.to_rgb(palette[level]))
+            colors[level] = colorsys.hls_to_rgb(h, l, s * 0.75)
+        lum = min(colorsys.rgb_to_hls(*rgb)[1] for rgb in colors.values()) * 0.6
+        line_color = (lum, lum, lum)
+        line_kws = dict(color=line_color, linewidth=0.8)
+
+        # Plot: one bxp call per category, dodged within each gene slot
+        fig, ax = plt.subplots(figsize=figsize, dpi=300)
+        box_width = 0.9 / len(hue_levels)
+        legend_handles = []
+        for k, level in enumerate(hue_levels):
+            level_stats = stats.xs(level, level=1)
+            ax.bxp(
+                level_stats.to_dict("records"),
+                positions=level_stats.index.to_numpy() + box_width * (k + 0.5) - 0.45,
+                widths=box_width,
+                capwidths=0.5 * box_width,
+                patch_artist=True,
+                manage_ticks=False,
+                boxprops=dict(facecolor=colors[level], edgecolor=line_color, linewidth=0.8),
+                medianprops=dict(solid_capstyle="butt", **line_kws),
+                whiskerprops=dict(solid_capstyle="butt", **line_kws),
+                capprops=line_kws,
+                flierprops=flier_props
+            )
+            legend_handles.append(patches.Rectangle(
+                (0, 0), 0, 0, facecolor=colors[level], edgecolor=line_color, linewidth=0.8, label=level
+            ))
+
+        ax.set_xticks(range(len(gene_order)))
+        ax.set_xticklabels(gene_order)
+        ax.set_xlim(-0.5, len(gene_order) - 0.5)
+
+        # Aesthetics
+        if y_limit:
+            ax.set_ylim(top=y_limit)
+        ax.set_title(title, pad=10)
+        ax.set_xlabel("Gene")
+        ax.set_ylabel("Expression")
+        plt.xticks(rotation=rotation, ha="right")
+
+        # Legend
+        legend = ax.legend(handles=legend_handles, title="Category", bbox_to_anchor=(1.01, 1), loc="upper left", frameon=True)
+        legend.get_frame().set_linewidth(1.0)
+        legend.get_frame().set_edgecolor("black")
+
+        # Grid and spines
+        ax.yaxis.grid(True, linewidth=0.4)
+        ax.set_axisbelow(True)
+        for spine in ax.spines.values():
+            spine.set_linewidth(1.5)
+            spine.set_color("black")
+
+        plt.tight_layout()
+
+        # Export
+        if export:
+            os.makedirs(export_dir, exist_ok=True)
+            for fmt in export_formats:
+                plt.savefig(f"{export_dir}/{export_name}.{fmt}", format=fmt, bbox_inches="tight")
 
-    # Aesthetics
-    if y_limit:
-        ax.set_ylim(top=y_limit)
-    ax.set_title(title, pad=10)
-    ax.set_xlabel("Gene")
-    ax.set_ylabel("Expression")
-    plt.xticks(rotation=rotation, ha="right")
-
-    # Legend
-    legend = ax.legend(title="Category", bbox_to_anchor=(1.01, 1), loc="upper left", frameon=True)
-    legend.get_frame().set_linewidth(1.0)
-    legend.get_frame().set_edgecolor("black")
-
-    # Grid and spines
-    ax.yaxis.grid(True, linewidth=0.4)
-    ax.set_axisbelow(True)
-    for spine in ax.spines.values():
-        spine.set_linewidth(1.5)
-        spine.set_color("black")
-
-    plt.tight_layout()
-
-    # Export
-    if export:
-        os.makedirs(export_dir, exist_ok=True)
-        for fmt in export_formats:
-            plt.savefig(f"{export_dir}/{export_name}.{fmt}", format=fmt, bbox_inches="tight")
-
-    plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
@@ -3,8 +3,23 @@ import matplotlib.patches as patches
 import numpy as np
 import os
 import pandas as pd
+from matplotlib.collections import PatchCollection
 from matplotlib.lines import Line2D
 
+_DEFAULT_RC = {
+    'font.family': 'serif',
+    'font.serif': ['Times New Roman', 'Times', 'DejaVu Serif'],
+    'font.size': 14,
+    'axes.labelsize': 14,
+    'axes.titlesize': 16,
+    'xtick.labelsize': 12,
+    'ytick.labelsize': 12,
+    'legend.fontsize': 12,
+    'axes.linewidth': 1.5,
+    'pdf.fonttype': 42
+}
+
+
 def plot_pathway_gene_heatmap(
     df: pd.DataFrame,
     pathway_col: str = "Cleaned_Pathway",
@@ -16,7 +31,8 @@ def plot_pathway_gene_heatmap(
     export: bool = False,
     export_dir: str = "Figures",
     export_name: str = "pathway_gene_heatmap",
-    export_formats: list = ["pdf", "svg"]
+    export_formats: list = ["pdf", "svg"],
+    show: bool = True
 ):
     """
     Create a heatmap showing gene membership across pathways, grouped by biological category.
@@ -45,137 +61,122 @@ def plot_pathway_gene_heatmap(
         Filename (without extension).
     export_formats : list
         Formats to export (e.g., pdf, svg, png).
+    show : bool
+        Whether to display the figure; when False it is closed instead.
     """
 
     # ------------------ Style ------------------
-    if style_config:
-        plt.rcParams.update(style_config)
-    else:
-        plt.rcParams.update({
-            'font.family': 'serif',
-            'font.serif': ['Times New Roman', 'Times', 'DejaVu Serif'],
-            'font.size': 14,
-            'axes.labelsize': 14,
-            'axes.titlesize': 16,
-            'xtick.labelsize': 12,
-            'ytick.labelsize': 12,
-            'legend.fontsize': 12,
-            'axes.linewidth': 1.5,
-            'pdf.fonttype': 42
-        })
-
-    # ------------------ Prepare Data ------------------
-    df_valid = df[df[pathway_col].notna()].copy()
-
-    # Sort pathways by category and name
-    pathway_order_df = (
-        df_valid[[pathway_col, category_col]]
-        .drop_duplicates()
-        .sort_values([category_col, pathway_col])
-        .reset_index(drop=True)
-    )
-
-    # Assign compact Y positions grouped by category
-    gap = 1
-    category_offsets = {}
-    offset = 0
-    for cat, group in pathway_order_df.groupby(category_col):
-        category_offsets[cat] = offset
-        offset += len(group) + gap
-
-    pathway_order_df["compact_y_pos"] = (
-        pathway_order_df.groupby(category_col).cumcount()
-        + pathway_order_df[category_col].map(category_offsets)
-    )
-
-    # ------------------ Build Pathway-Gene Matrix ------------------
-    heatmap_df = df_valid[[pathway_col, gene_col]].drop_duplicates()
-    heatmap_df["Present"] = 1
-    matrix = heatmap_df.pivot_table(index=pathway_col, columns=gene_col, values="Present", fill_value=0)
-    matrix = matrix.reindex(pathway_order_df[pathway_col])
-
-    # Melt to long format
-    heatmap_long = matrix.reset_index().melt(id_vars=pathway_col, var_name=gene_col, value_name="Present")
-    heatmap_long = heatmap_long[heatmap_long["Present"] == 1]
-    heatmap_long = heatmap_long.merge(pathway_order_df, on=pathway_col, how="left")
-
-    # Assign X positions for genes
-    gene_order = sorted(heatmap_long[gene_col].unique())
-    gene_to_x = {gene: i for i, gene in enumerate(gene_order)}
-    heatmap_long["x_pos"] = heatmap_long[gene_col].map(gene_to_x)
-
-    # ------------------ Palette ------------------
-    bio_categories = sorted(df_valid[category_col].dropna().unique())
-    if palette is None:
-        default_palette = [
-            '#DF8F44', '#00A1D5', '#B24745',
-            '#79AF97', '#6A6599', '#374E55', '#80796B',
-            '#AA4499', '#117733', '#999933', '#882255'
-        ]
-        palette = default_palette[:len(bio_categories)]
-    category_palette = dict(zip(bio_categories, palette))
+    with plt.rc_context(style_config or _DEFAULT_RC):
+        # ------------------ Prepare Data ------------------
+        df_valid = df[df[pathway_col].notna()].copy()
+
+        # Sort pathways by category and name
+        pathway_order_df = (
+            df_valid[[pathway_col, category_col]]
+            .drop_duplicates()
+            .sort_values([category_col, pathway_col])
+            .reset_index(drop=True)
+        )
 
-    # ------------------ Plot ------------------
-    fig, ax = plt.subplots(figsize=(len(gene_order) * 0.6, (offset + 2) * 0.5), dpi=300)
+        # Assign compact Y positions grouped by category: rows are sorted by category,
+        # so each row sits at its row number plus one gap per preceding category
+        gap = 1
+        category_codes = pd.factorize(pathway_order_df[category_col])[0]
+        pathway_order_df["compact_y_pos"] = (
+            pd.Series(np.arange(len(pathway_order_df)) + gap * category_codes)
+            .where(category_codes >= 0)
+        )
+        offset = int((category_codes >= 0).sum()) + gap * (category_codes.max(initial=-1) + 1)
+
+        # ------------------ Pathway-Gene Memberships ------------------
+        # One row per (pathway, gene) edge; the dense membership matrix is never needed
+        heatmap_long = (
+            df_valid[[pathway_col, gene_col]]
+            .dropna(subset=[gene_col])
+            .drop_duplicates()
+            .merge(pathway_order_df, on=pathway_col, how="left")
+        )
 
-    # Draw colored squares
-    for _, row in heatmap_long.iterrows():
-        rect = patches.Rectangle(
-            (row["x_pos"] - 0.5, row["compact_y_pos"] - 0.5),
-            1, 1,
+        # Assign X positions for genes
+        gene_order = sorted(heatmap_long[gene_col].unique())
+        heatmap_long["x_pos"] = pd.Categorical(heatmap_long[gene_col], categories=gene_order).codes
+
+        # ------------------ Palette ------------------
+        bio_categories = sorted(df_valid[category_col].dropna().unique())
+        if palette is None:
+            default_palette = [
+                '#DF8F44', '#00A1D5', '#B24745',
+                '#79AF97', '#6A6599', '#374E55', '#80796B',
+                '#AA4499', '#117733', '#999933', '#882255'
+            ]
+            palette = default_palette[:len(bio_categories)]
+        category_palette = dict(zip(bio_categories, palette))
+
+        # ------------------ Plot ------------------
+        fig, ax = plt.subplots(figsize=(len(gene_order) * 0.6, (offset + 2) * 0.5), dpi=300)
+
+        # Draw colored squares as one collection
+        corners = heatmap_long[["x_pos", "compact_y_pos"]].to_numpy(dtype=float) - 0.5
+        cells = PatchCollection(
+            [patches.Rectangle(xy, 1, 1) for xy in corners],
             linewidth=0.3,
             edgecolor="black",
-            facecolor=category_palette[row[category_col]]
+            facecolor=heatmap_long[category_col].map(category_palette).to_list()
+        )
+        ax.add_collection(cells)
+
+        # Axes setup
+        ax.set_xlim(-0.5, len(gene_order) - 0.5)
+        ax.set_ylim(offset + 1, -1)
+        ax.set_xticks(range(len(gene_order)))
+        ax.set_xticklabels(gene_order, rotation=90)
+        ax.set_yticks(pathway_order_df["compact_y_pos"])
+        ax.set_yticklabels(pathway_order_df[pathway_col])
+
+        # Grid lines
+        # Each set is one full-span line collection, like a set of axvline/axhline calls
+        ax.vlines(np.arange(len(gene_order) + 1) - 0.5, 0, 1, transform=ax.get_xaxis_transform(),
+                  colors="gray", linewidth=0.3, zorder=1)
+        ax.hlines(np.arange(offset + 2) - 0.5, 0, 1, transform=ax.get_yaxis_transform(),
+                  colors="gray", linewidth=0.3, zorder=1)
+
+        # Category dividers
+        category_ends = pathway_order_df.groupby(category_col)["compact_y_pos"].max().to_numpy()
+        ax.hlines(category_ends + 0.5, 0, 1, transform=ax.get_yaxis_transform(),
+                  colors="gray", linestyles="--", linewidth=0.6)
+
+        # Spines
+        for spine in ax.spines.values():
+            spine.set_linewidth(1.5)
+            spine.set_color("black")
+
+        # Legend
+        legend_elements = [
+            Line2D([0], [0], marker="s", color="w", label=cat,
+                   markerfacecolor=category_palette[cat], markeredgecolor="black", markersize=10)
+            for cat in bio_categories
+        ]
+        legend = ax.legend(
+            handles=legend_elements,
+            title="Category",
+            loc="center left",
+            bbox_to_anchor=(1.01, 0.5),
+            frameon=True
         )
-        ax.add_patch(rect)
-
-    # Axes setup
-    ax.set_xlim(-0.5, len(gene_order) - 0.5)
-    ax.set_ylim(offset + 1, -1)
-    ax.set_xticks(range(len(gene_order)))
-    ax.set_xticklabels(gene_order, rotation=90)
-    ax.set_yticks(pathway_order_df["compact_y_pos"])
-    ax.set_yticklabels(pathway_order_df[pathway_col])
-
-    # Grid lines
-    for x in range(len(gene_order) + 1):
-        ax.axvline(x - 0.5, color="gray", linewidth=0.3, zorder=1)
-    for y in range(offset + 2):
-        ax.axhline(y - 0.5, color="gray", linewidth=0.3, zorder=1)
-
-    # Category dividers
-    for end in pathway_order_df.groupby(category_col)["compact_y_pos"].max():
-        ax.axhline(y=end + 0.5, color="gray", linestyle="--", linewidth=0.6)
-
-    # Spines
-    for spine in ax.spines.values():
-        spine.set_linewidth(1.5)
-        spine.set_color("black")
-
-    # Legend
-    legend_elements = [
-        Line2D([0], [0], marker="s", color="w", label=cat,
-               markerfacecolor=category_palette[cat], markeredgecolor="black", markersize=10)
-        for cat in bio_categories
-    ]
-    legend = ax.legend(
-        handles=legend_elements,
-        title="Category",
-        loc="center left",
-        bbox_to_anchor=(1.01, 0.5),
-        frameon=True
-    )
-    legend.get_title().set_fontsize(12)
-    legend.get_frame().set_linewidth(1.0)
-
-    # Title
-    plt.title(title, fontsize=16, pad=10)
-
-    # Export
-    plt.tight_layout()
-    if export:
-        os.makedirs(export_dir, exist_ok=True)
-        for fmt in export_formats:
-            plt.savefig(os.path.join(export_dir, f"{export_name}.{fmt}"), format=fmt, bbox_inches="tight")
-
-    plt.show()
+        legend.get_title().set_fontsize(12)
+        legend.get_frame().set_linewidth(1.0)
+
+        # Title
+        plt.title(title, fontsize=16, pad=10)
+
+        # Export
+        plt.tight_layout()
+        if export:
+            os.makedirs(export_dir, exist_ok=True)
+            for fmt in export_formats:
+                plt.savefig(os.path.join(export_dir, f"{export_name}.{fmt}"), format=fmt, bbox_inches="tight")
+
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
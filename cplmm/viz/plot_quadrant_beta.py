@@ -2,6 +2,22 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 
+_DEFAULT_RC = {
+    'font.family': 'serif',
+    'font.serif': ['Times New Roman', 'Times', 'DejaVu Serif'],
+    'font.size': 10,
+    'axes.labelsize': 10,
+    'axes.titlesize': 10,
+    'legend.fontsize': 10,
+    'lines.linewidth': 1.5,
+    'axes.linewidth': 1.5,
+    'axes.grid': True,
+    'axes.grid.axis': 'y',
+    'grid.color': '#DDDDDD',
+    'grid.linewidth': 0.5
+}
+
+
 def plot_quadrant_beta(
     wald_df,
     beta_x_col: str = "Beta 1",
@@ -10,11 +26,13 @@ def plot_quadrant_beta(
     protein_col: str = "Protein",
     fdr_threshold: float = 0.05,
     annotate: bool = True,
+    max_annotations: int = 50,
     style_config: dict = None,
     export: bool = False,
     export_dir: str = "Figures",
     export_name: str = "quadrant_plot",
-    export_formats: list = ["pdf", "svg"]
+    export_formats: list = ["pdf", "svg"],
+    show: bool = True
 ):
     """
     Generate a quadrant plot of beta coefficients from Wald test results.
@@ -35,6 +53,9 @@ def plot_quadrant_beta(
         Significance threshold for FDR.
     annotate : bool
         Whether to annotate significant proteins.
+    max_annotations : int
+        Annotate at most this many significant proteins, those farthest from the
+        origin (None annotates all).
     style_config : dict
         Optional matplotlib rcParams.
     export : bool
@@ -45,87 +66,80 @@ def plot_quadrant_beta(
         Base filename for exported plots.
     export_formats : list
         Formats to export (e.g., ["pdf", "svg", "png"]).
+    show : bool
+        Whether to display the figure; when False it is closed instead.
     """
     
     # Style
-    if style_config:
-        plt.rcParams.update(style_config)
-    else:
-        plt.rcParams.update({
-            'font.family': 'serif',
-            'font.serif': ['Times New Roman', 'Times', 'DejaVu Serif'],
-            'font.size': 10,
-            'axes.labelsize': 10,
-            'axes.titlesize': 10,
-            'legend.fontsize': 10,
-            'lines.linewidth': 1.5,
-            'axes.linewidth': 1.5,
-            'axes.grid': True,
-            'axes.grid.axis': 'y',
-            'grid.color': '#DDDDDD',
-            'grid.linewidth': 0.5
-        })
-
-    # Extract data
-    x = wald_df[beta_x_col].values
-    y = wald_df[beta_y_col].values
-    fdr = wald_df[fdr_col].values
-    proteins = wald_df[protein_col].values
-
-    # Identify significant points
-    significant = fdr < fdr_threshold
-
-    # Plot
-    plt.figure(figsize=(6, 6), dpi=300)
-
-    # Non-significant points
-    plt.scatter(x[~significant], y[~significant], color='black', s=10, alpha=0.3, label='Non-significant')
-
-    # Significant points
-    plt.scatter(x[significant], y[significant], color='#B24745', s=20, alpha=0.8, label=f'Significant (FDR < {fdr_threshold})')
-
-    # Axes at zero
-    plt.axhline(0, color='black', linewidth=1)
-    plt.axvline(0, color='black', linewidth=1)
-
-    # Annotate significant proteins
-    if annotate:
-        for i in np.where(significant)[0]:
-            plt.text(x[i], y[i], proteins[i], fontsize=9, color='#B24745', ha='right', va='bottom')
-
-    # Quadrant counts
-    q1 = np.sum((x > 0) & (y > 0))
-    q2 = np.sum((x < 0) & (y > 0))
-    q3 = np.sum((x < 0) & (y < 0))
-    q4 = np.sum((x > 0) & (y < 0))
-
-    plt.text(max(x) * 0.7, max(y) * 0.9, f'n={q1}', fontsize=10)
-    plt.text(min(x) * 0.7, max(y) * 0.9, f'n={q2}', fontsize=10)
-    plt.text(min(x) * 0.7, min(y) * 0.9, f'n={q3}', fontsize=10)
-    plt.text(max(x) * 0.7, min(y) * 0.9, f'n={q4}', fontsize=10)
-
-    # Labels
-    plt.xlabel(f"{beta_x_col} (Before Onset)" if "1" in beta_x_col else beta_x_col)
-    plt.ylabel(f"{beta_y_col} (After Onset)" if "3" in beta_y_col else beta_y_col)
-    plt.title("Quadrant Plot of Beta Coefficients")
-
-    # Spines
-    ax = plt.gca()
-    for spine in ax.spines.values():
-        spine.set_linewidth(1.5)
-        spine.set_color('black')
-
-    # Axis limits with 10% padding
-    plt.xlim([min(x) * 1.1, max(x) * 1.1])
-    plt.ylim([min(y) * 1.1, max(y) * 1.1])
-
-    plt.legend(frameon=False, loc='best')
-    plt.tight_layout()
-
-    # Export
-    if export:
-        os.makedirs(export_dir, exist_ok=True)
-        for fmt in export_formats:
-            plt.savefig(os.path.join(export_dir, f"{export_name}.{fmt}"), format=fmt, bbox_inches="tight")
-
-    plt.show()
+    with plt.rc_context(style_config or _DEFAULT_RC):
+        # Extract data; single precision is plenty for plotting coordinates
+        x = wald_df[beta_x_col].values.astype(np.float32, copy=False)
+        y = wald_df[beta_y_col].values.astype(np.float32, copy=False)
+        fdr = wald_df[fdr_col].values
+        proteins = wald_df[protein_col].values
+
+        # Identify significant points once, as index arrays shared by the scatters and labels
+        significant = fdr < fdr_threshold
+        idx_sig = np.flatnonzero(significant)
+        idx_ns = np.flatnonzero(~significant)
+
+        # Plot
+        fig = plt.figure(figsize=(6, 6), dpi=300)
+
+        # Non-significant points
+        plt.scatter(x.take(idx_ns), y.take(idx_ns), color='black', s=10, alpha=0.3, label='Non-significant', rasterized=True)
+
+        # Significant points
+        plt.scatter(x.take(idx_sig), y.take(idx_sig), color='#B24745', s=20, alpha=0.8, label=f'Significant (FDR < {fdr_threshold})', rasterized=True)
+
+        # Axes at zero
+        plt.axhline(0, color='black', linewidth=1)
+        plt.axvline(0, color='black', linewidth=1)
+
+        # Annotate significant proteins
+        if annotate:
+            labeled = idx_sig
+            if max_annotations is not None and len(labeled) > max_annotations:
+                distance = x.take(labeled) ** 2 + y.take(labeled) ** 2
+                labeled = np.sort(labeled.take(np.argsort(-distance)[:max_annotations]))
+            for i in labeled:
+                plt.text(x[i], y[i], proteins[i], fontsize=9, color='#B24745', ha='right', va='bottom')
+
+        # Quadrant counts in one pass: code points by sign, skipping zeros and NaNs
+        off_axes = (np.abs(x) > 0) & (np.abs(y) > 0)
+        quadrant = 2 * np.signbit(x).astype(np.int8) + np.signbit(y)
+        q1, q4, q2, q3 = np.bincount(quadrant[off_axes], minlength=4)
+
+        plt.text(max(x) * 0.7, max(y) * 0.9, f'n={q1}', fontsize=10)
+        plt.text(min(x) * 0.7, max(y) * 0.9, f'n={q2}', fontsize=10)
+        plt.text(min(x) * 0.7, min(y) * 0.9, f'n={q3}', fontsize=10)
+        plt.text(max(x) * 0.7, min(y) * 0.9, f'n={q4}', fontsize=10)
+
+        # Labels
+        plt.xlabel(f"{beta_x_col} (Before Onset)" if "1" in beta_x_col else beta_x_col)
+        plt.ylabel(f"{beta_y_col} (After Onset)" if "3" in beta_y_col else beta_y_col)
+        plt.title("Quadrant Plot of Beta Coefficients")
+
+        # Spines
+        ax = plt.gca()
+        for spine in ax.spines.values():
+            spine.set_linewidth(1.5)
+            spine.set_color('black')
+
+        # Axis limits with 10% padding
+        plt.xlim([min(x) * 1.1, max(x) * 1.1])
+        plt.ylim([min(y) * 1.1, max(y) * 1.1])
+
+        plt.legend(frameon=False, loc='best')
+        plt.tight_layout()
+
+        # Export
+        if export:
+            os.makedirs(export_dir, exist_ok=True)
+            for fmt in export_formats:
+                plt.savefig(os.path.join(export_dir, f"{export_name}.{fmt}"), format=fmt, bbox_inches="tight")
+
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
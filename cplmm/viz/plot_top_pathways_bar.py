@@ -1,5 +1,7 @@
+import colorsys
+import matplotlib.colors as mcolors
+import matplotlib.patches as patches
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import pandas as pd
 
@@ -17,7 +19,8 @@ def plot_top_pathways_bar(
     export: bool = False,
     export_dir: str = "Figures",
     export_name: str = "top_pathways_bar",
-    export_formats: list = ["pdf", "svg"]
+    export_formats: list = ["pdf", "svg"],
+    show: bool = True
 ):
     """
     Plot top N pathways ranked by gene count, annotated with log(q-values).
@@ -52,23 +55,21 @@ def plot_top_pathways_bar(
         Base file name for exports.
     export_formats : list
         List of formats to export (e.g., pdf, svg, png).
+    show : bool
+        Whether to display the figure; when False it is closed instead.
     """
     
-    # Prepare top pathways
+    # Prepare top pathways: gene count, best logQ, and category in one groupby
     top_pathways = (
-        df.groupby(pathway_col)[gene_col]
-        .nunique()
-        .nlargest(top_n)
+        df.groupby(pathway_col)
+        .agg(**{
+            "GeneCount": (gene_col, "nunique"),
+            logq_col: (logq_col, "max"),
+            category_col: (category_col, "first")
+        })
+        .nlargest(top_n, "GeneCount")
         .reset_index()
-        .rename(columns={gene_col: "GeneCount"})
     )
-
-    # Merge with logQ and categories
-    logqvals = df.groupby(pathway_col)[logq_col].max().reset_index()
-    cats = df.groupby(pathway_col)[category_col].first().reset_index()
-
-    top_pathways = top_pathways.merge(logqvals, on=pathway_col)
-    top_pathways = top_pathways.merge(cats, on=pathway_col)
     top_pathways = top_pathways.sort_values("GeneCount", ascending=False)
 
     # Prepare palette
@@ -82,24 +83,43 @@ def plot_top_pathways_bar(
         palette = default_palette[:len(bio_categories)]
     category_palette = dict(zip(bio_categories, palette))
 
-    # Plot
-    plt.figure(figsize=(9, 6))
-    ax = sns.barplot(
-        data=top_pathways,
-        x="GeneCount",
-        y=pathway_col,
-        hue=category_col,
-        dodge=False,
-        palette=category_palette
+    # Seaborn-style muted bar colors, legend in order of first appearance
+    bar_categories = top_pathways[category_col]
+    legend_categories = list(bar_categories.dropna().unique())
+    bar_colors = {}
+    for cat in legend_categories:
+        h, l, s = colorsys.rgb_to_hls(*mcolors.to_rgb(category_palette[cat]))
+        bar_colors[cat] = colorsys.hls_to_rgb(h, l, s * 0.75)
+
+    # Plot: one horizontal bar per pathway, top row first
+    fig = plt.figure(figsize=(9, 6))
+    ax = plt.gca()
+    y_pos = np.arange(len(top_pathways))
+    has_category = bar_categories.notna().to_numpy()
+    ax.barh(
+        y_pos[has_category],
+        top_pathways["GeneCount"].to_numpy()[has_category],
+        height=0.8,
+        color=[bar_colors[cat] for cat in bar_categories[has_category]]
     )
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(top_pathways[pathway_col])
+    ax.set_ylim(len(top_pathways) - 0.5, -0.5)
+    legend_handles = [
+        patches.Rectangle((0, 0), 0, 0, facecolor=bar_colors[cat], label=cat)
+        for cat in legend_categories
+    ]
 
     # Annotate bars with log(q) values
     if annotate:
-        for i, row in top_pathways.iterrows():
+        # Bars are drawn in row order, so the row position is the bar's y coordinate
+        gene_counts = top_pathways["GeneCount"].to_numpy()
+        logq_values = top_pathways[logq_col].to_numpy()
+        for i, (count, val) in enumerate(zip(gene_counts, logq_values)):
             ax.text(
-                row["GeneCount"] + 0.3,
-                list(top_pathways.index).index(i),
-                annotation_format.format(val=row[logq_col]),
+                count + 0.3,
+                i,
+                annotation_format.format(val=val),
                 va="center",
                 ha="left",
                 fontsize=9
@@ -109,7 +129,7 @@ def plot_top_pathways_bar(
     ax.set_xlabel("Gene Count")
     ax.set_ylabel("Pathway")
     ax.set_title(title)
-    ax.legend(title="Biological Category", bbox_to_anchor=(1.02, 0.5), loc="upper left")
+    ax.legend(handles=legend_handles, title="Biological Category", bbox_to_anchor=(1.02, 0.5), loc="upper left")
     plt.tight_layout()
 
     # Export
@@ -119,4 +139,7 @@ def plot_top_pathways_bar(
         for fmt in export_formats:
             plt.savefig(f"{export_dir}/{export_name}.{fmt}", format=fmt, bbox_inches="tight")
 
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
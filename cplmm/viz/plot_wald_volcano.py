@@ -1,8 +1,23 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 
+_DEFAULT_RC = {
+    'font.family': 'serif',
+    'font.serif': ['Times New Roman', 'Times', 'DejaVu Serif'],
+    'font.size': 10,
+    'axes.labelsize': 10,
+    'axes.titlesize': 10,
+    'legend.fontsize': 10,
+    'lines.linewidth': 1.5,
+    'axes.linewidth': 1.5,
+    'axes.grid': True,
+    'axes.grid.axis': 'y',
+    'grid.color': '#DDDDDD',
+    'grid.linewidth': 0.5
+}
+
+
 def plot_wald_volcano(
     wald_df,
     pval_col: str = "P-value 1",
@@ -14,11 +29,13 @@ def plot_wald_volcano(
     fdr_threshold: float = 0.05,
     annotate: bool = True,
     annotate_list: list = None,
+    max_annotations: int = 50,
     style_config: dict = None,
     export: bool = False,
     export_dir: str = "Figures",
     export_name: str = "wald_volcano",
-    export_formats: list = ["pdf", "svg"]
+    export_formats: list = ["pdf", "svg"],
+    show: bool = True
 ):
     """
     Generate a volcano plot for Wald test results.
@@ -45,6 +62,9 @@ def plot_wald_volcano(
         Whether to annotate significant proteins.
     annotate_list : list
         Optional list of proteins to annotate (overrides automatic).
+    max_annotations : int
+        When annotating automatically, label at most this many significant proteins,
+        those with the smallest p-values (None annotates all).
     style_config : dict
         Custom matplotlib rcParams (font size, grid, etc.).
     export : bool
@@ -55,88 +75,90 @@ def plot_wald_volcano(
         Base name for saved file.
     export_formats : list
         List of export formats (e.g., ["pdf", "svg"]).
+    show : bool
+        Whether to display the figure; when False it is closed instead.
     """
     import pandas as pd
     
     # Style
-    if style_config:
-        plt.rcParams.update(style_config)
-    else:
-        plt.rcParams.update({
-            'font.family': 'serif',
-            'font.serif': ['Times New Roman', 'Times', 'DejaVu Serif'],
-            'font.size': 10,
-            'axes.labelsize': 10,
-            'axes.titlesize': 10,
-            'legend.fontsize': 10,
-            'lines.linewidth': 1.5,
-            'axes.linewidth': 1.5,
-            'axes.grid': True,
-            'axes.grid.axis': 'y',
-            'grid.color': '#DDDDDD',
-            'grid.linewidth': 0.5
+    with plt.rc_context(style_config or _DEFAULT_RC):
+        # Compute metrics on the raw arrays, without copying the input frame
+        pval = wald_df[pval_col].to_numpy(dtype=float)
+        fdr = wald_df[fdr_col].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fold_change = wald_df[beta_after_col].to_numpy(dtype=float) / wald_df[beta_before_col].to_numpy(dtype=float)
+            log2_fc = np.log2(np.abs(fold_change))
+            log2_fc *= np.sign(fold_change)
+
+        # Significance assignment
+        significant = (pval < pval_threshold) & (fdr < fdr_threshold)
+
+        # Only the plotted columns; coordinates only need single precision
+        plot_df = pd.DataFrame({
+            "log2FoldChange": log2_fc.astype(np.float32),
+            "-log10(pval)": (-np.log10(pval)).astype(np.float32),
+            protein_col: wald_df[protein_col].to_numpy()
         })
 
-    # Copy data to avoid modification
-    df = wald_df.copy()
-
-    # Compute metrics
-    df["-log10(pval)"] = -np.log10(df[pval_col])
-    df["FoldChange"] = df[beta_after_col] / df[beta_before_col]
-    df["log2FoldChange"] = np.sign(df["FoldChange"]) * np.log2(np.abs(df["FoldChange"]))
-
-    # Significance assignment
-    df["Significance"] = "Not Significant"
-    df.loc[(df[pval_col] < pval_threshold) & (df[fdr_col] < fdr_threshold), "Significance"] = "Significant"
-
-    # Plot
-    plt.figure(figsize=(7, 5), dpi=300)
-    sns.scatterplot(
-        data=df,
-        x="log2FoldChange",
-        y="-log10(pval)",
-        hue="Significance",
-        palette={"Not Significant": "gray", "Significant": "#B24745"},
-        alpha=0.7,
-        edgecolor="black",
-        linewidth=0.5
-    )
-
-    # Threshold lines
-    plt.axhline(-np.log10(pval_threshold), linestyle="dashed", color="black", linewidth=1)
-    plt.axvline(-1, linestyle="dashed", color="blue", linewidth=1)
-    plt.axvline(1, linestyle="dashed", color="blue", linewidth=1)
-
-    # Labels
-    plt.xlabel("log2 Fold Change")
-    plt.ylabel("-log10(p-value)")
-    plt.title("Volcano Plot for Wald Test")
-
-    # Black spines
-    ax = plt.gca()
-    for spine in ax.spines.values():
-        spine.set_linewidth(1)
-        spine.set_color("black")
-
-    plt.legend(title="Significance", loc="upper left", bbox_to_anchor=(1.02, 1), frameon=True)
-
-    # Annotation logic
-    if annotate:
-        if annotate_list:
-            annot_df = df[df[protein_col].isin(annotate_list)]
-        else:
-            annot_df = df[df["Significance"] == "Significant"]
+        # Plot: one scatter per significance class, legend in order of first appearance
+        fig = plt.figure(figsize=(7, 5), dpi=300)
+        ax = plt.gca()
+        classes = [
+            ("Not Significant", ~significant, "gray"),
+            ("Significant", significant, "#B24745"),
+        ]
+        classes = sorted((c for c in classes if c[1].any()), key=lambda c: np.argmax(c[1]))
+        for label, mask, color in classes:
+            ax.scatter(
+                plot_df["log2FoldChange"].to_numpy()[mask],
+                plot_df["-log10(pval)"].to_numpy()[mask],
+                color=color,
+                alpha=0.7,
+                edgecolor="black",
+                linewidth=0.5,
+                label=label,
+                rasterized=True
+            )
+
+        # Threshold lines
+        plt.axhline(-np.log10(pval_threshold), linestyle="dashed", color="black", linewidth=1)
+        plt.axvline(-1, linestyle="dashed", color="blue", linewidth=1)
+        plt.axvline(1, linestyle="dashed", color="blue", linewidth=1)
 
-        for _, row in annot_df.iterrows():
-            plt.text(row["log2FoldChange"], row["-log10(pval)"], row[protein_col],
-                     fontsize=9, ha="right", va="bottom", color="black")
+        # Labels
+        plt.xlabel("log2 Fold Change")
+        plt.ylabel("-log10(p-value)")
+        plt.title("Volcano Plot for Wald Test")
 
-    plt.tight_layout()
+        # Black spines
+        for spine in ax.spines.values():
+            spine.set_linewidth(1)
+            spine.set_color("black")
 
-    # Export
-    if export:
-        os.makedirs(export_dir, exist_ok=True)
-        for fmt in export_formats:
-            plt.savefig(os.path.join(export_dir, f"{export_name}.{fmt}"), format=fmt, bbox_inches="tight")
+        plt.legend(title="Significance", loc="upper left", bbox_to_anchor=(1.02, 1), frameon=True)
 
-    plt.show()
+        # Annotation logic
+        if annotate:
+            if annotate_list:
+                annot_df = plot_df[plot_df[protein_col].isin(annotate_list)]
+            else:
+                annot_df = plot_df[significant]
+                if max_annotations is not None and len(annot_df) > max_annotations:
+                    rank = annot_df["-log10(pval)"].rank(method="first", ascending=False)
+                    annot_df = annot_df[rank <= max_annotations]
+
+            for fc, logp, label in zip(annot_df["log2FoldChange"], annot_df["-log10(pval)"], annot_df[protein_col]):
+                plt.text(fc, logp, label, fontsize=9, ha="right", va="bottom", color="black")
+
+        plt.tight_layout()
+
+        # Export
+        if export:
+            os.makedirs(export_dir, exist_ok=True)
+            for fmt in export_formats:
+                plt.savefig(os.path.join(export_dir, f"{export_name}.{fmt}"), format=fmt, bbox_inches="tight")
+
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from cplmm import fit_cplmm_all_proteins
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def _load(name):
+    return pd.read_csv(os.path.join(DATA_DIR, name))
+
+
+def test_fit_cplmm_drops_missing_protein_values():
+    df_status_change = _load("df_status_change_toy.csv")
+    df_normal = _load("df_normal_only_toy.csv")
+    df_abnormal = _load("df_abnormal_only_toy.csv")
+    df_status_change.loc[3, "P1"] = np.nan
+
+    results = fit_cplmm_all_proteins(
+        df_status_change, df_normal, df_abnormal, ["P1"], n_jobs=1
+    )
+
+    row = results.iloc[0]
+    assert row["Protein"] == "P1"
+    assert np.isfinite(row[["Beta 1", "Beta 2", "Beta 3", "Beta 4", "MSE Status"]].astype(float)).all()
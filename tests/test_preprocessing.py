@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from cplmm.preprocessing.preprocessing import (
+    correct_status_by_onset,
+    enforce_unidirectional_status_change,
+    get_status_groups,
+    identify_status_change_subjects,
+    set_onset_age_for_normals,
+)
+
+
+def _visits():
+    return pd.DataFrame({
+        "subject_id": ["a", "a", "a", np.nan, "b", "b", "c", "c"],
+        "status_cleaned": ["Normal", "Abnormal", "Normal", "Normal", "Normal", "Normal", "Abnormal", "Normal"],
+        "procedure_date": [1, 2, 3, 1, 2, 1, 1, 2],
+    })
+
+
+def test_enforce_unidirectional_status_change_keeps_missing_subject_rows():
+    result = enforce_unidirectional_status_change(_visits())
+
+    assert result.loc[3, "status_cleaned"] == "Normal"
+    assert result.loc[[0, 1, 2], "status_cleaned"].tolist() == ["Normal", "Abnormal", "Abnormal"]
+    assert result.loc[[4, 5], "status_cleaned"].tolist() == ["Normal", "Normal"]
+    assert result.loc[[6, 7], "status_cleaned"].tolist() == ["Abnormal", "Abnormal"]
+
+
+def test_set_onset_age_for_normals_matches_per_subject_loop():
+    df = _visits().rename(columns={"status_cleaned": "status_raw"})
+    df["age"] = [60.0, 61.0, 62.0, 70.0, 55.0, 54.0, 80.0, 81.0]
+    df["decage_mutated"] = np.nan
+
+    expected = df.copy()
+    for subid, visits in df.dropna(subset=["subject_id"]).groupby("subject_id"):
+        if set(visits["status_raw"]) == {"Normal"}:
+            expected.loc[expected["subject_id"] == subid, "decage_mutated"] = visits["age"].max()
+
+    result = set_onset_age_for_normals(df)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_status_groups_match_per_subject_filters():
+    df = _visits()
+
+    df_normal, df_abnormal = get_status_groups(df)
+    changed = identify_status_change_subjects(df)
+
+    assert df_normal.index.tolist() == [4, 5]
+    assert df_abnormal.index.tolist() == []
+    expected = df.sort_values(by=["subject_id", "procedure_date"]).groupby("subject_id").filter(
+        lambda x: (x["status_cleaned"] == "Normal").any() and (x["status_cleaned"] != "Normal").any()
+    )
+    pd.testing.assert_frame_equal(changed, expected)
+
+
+def test_correct_status_by_onset_keeps_categorical_dtype():
+    status_dtype = pd.CategoricalDtype(["Normal", "MCI", "Abnormal"], ordered=True)
+    df = pd.DataFrame({
+        "age": [60.0, 70.0, 65.0, 65.0, 65.0],
+        "onset_age": [65.0, 65.0, 65.0, np.nan, 60.0],
+        "status_cleaned": pd.Categorical(["Abnormal", "Normal", "Normal", "Abnormal", "MCI"], dtype=status_dtype),
+    })
+
+    expected = df.copy()
+    expected.loc[(expected["onset_age"] > expected["age"]) & (expected["status_cleaned"] == "Abnormal"), "status_cleaned"] = "Normal"
+    expected.loc[(expected["onset_age"] < expected["age"]) & (expected["status_cleaned"] == "Normal"), "status_cleaned"] = "Abnormal"
+
+    result = correct_status_by_onset(df)
+
+    assert result["status_cleaned"].dtype == status_dtype
+    pd.testing.assert_frame_equal(result, expected)
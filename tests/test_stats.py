@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2, mannwhitneyu
+from statsmodels.stats.multitest import multipletests
+
+from cplmm.stats import compare_groups_mannwhitney, compute_wald_test, pivot_expression_wide
+
+
+def _slopes():
+    return pd.DataFrame({
+        "Protein": ["P1", "P2", "P3", "P4", "P5", "P6"],
+        "Beta 1": [0.10, -0.02, 0.05, np.nan, 0.01, 0.00],
+        "SE Beta 1": [0.02, 0.03, 0.04, 0.02, 0.05, 0.00],
+        "Beta 3": [0.01, 0.04, 0.05, 0.02, -0.03, 0.00],
+        "SE Beta 3": [0.03, 0.02, 0.01, 0.02, 0.02, 0.00],
+        "Beta 2": [0.03, 0.00, -0.06, 0.01, 0.02, 0.01],
+        "SE Beta 2": [0.01, 0.02, 0.02, 0.03, 0.01, 0.02],
+        "Beta 4": [-0.01, 0.05, 0.02, 0.00, 0.02, 0.03],
+        "SE Beta 4": [0.02, 0.01, 0.03, 0.01, 0.01, 0.02],
+    })
+
+
+def _expression():
+    rng = np.random.default_rng(0)
+    rows = [
+        # Small samples without ties (exact test) next to a gene with ties
+        ("G1", [1.0, 2.0, 3.0, 4.0, 5.0], [6.0, 7.0, 8.0, 9.0, 10.0]),
+        ("G2", [1.0, 1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0, 9.0]),
+        # Large samples (asymptotic test), one with a missing value
+        ("G3", rng.normal(0, 1, 12), rng.normal(1, 1, 15)),
+        ("G4", np.append(rng.normal(0, 1, 11), np.nan), rng.normal(0, 1, 9)),
+        # Unequal small samples
+        ("G5", rng.normal(0, 1, 3), rng.normal(2, 1, 7)),
+    ]
+    records = [
+        (gene, value, source)
+        for gene, values1, values2 in rows
+        for source, values in (("A", values1), ("B", values2))
+        for value in values
+    ]
+    return pd.DataFrame(records, columns=["Gene", "Expression", "Source"])
+
+
+def test_compare_groups_mannwhitney_matches_per_gene_tests():
+    combined_expr = _expression()
+    genes = ["G1", "G2", "G3", "G4", "G5"]
+
+    expected = {}
+    for gene in genes:
+        values = combined_expr[combined_expr["Gene"] == gene].dropna(subset=["Expression"])
+        expected[gene] = mannwhitneyu(
+            values.loc[values["Source"] == "A", "Expression"],
+            values.loc[values["Source"] == "B", "Expression"],
+            alternative="two-sided",
+        )
+
+    # G1/G2 alone stack without NaN padding, so the test method must still be chosen per gene
+    for gene_list in (["G1", "G2"], genes):
+        for wide_cache in (None, pivot_expression_wide(combined_expr)):
+            result = compare_groups_mannwhitney(
+                combined_expr, gene_list, "A", "B", wide_cache=wide_cache
+            ).set_index("Gene")
+            for gene in gene_list:
+                assert result.loc[gene, "U_statistic"] == expected[gene].statistic
+                assert np.isclose(result.loc[gene, "p_value"], expected[gene].pvalue, rtol=1e-12, atol=0)
+
+
+def test_compute_wald_test_matches_per_row_loop():
+    # P6 has zero standard errors, which the original loop could not divide by
+    results_df = _slopes().iloc[:5]
+
+    # Reference: per-row statistics as in the original loop
+    expected = {}
+    for _, row in results_df.iterrows():
+        if row.drop("Protein").isna().any():
+            continue
+        stat_1 = (row["Beta 1"] - row["Beta 3"]) ** 2 / (row["SE Beta 1"] ** 2 + row["SE Beta 3"] ** 2)
+        stat_2 = (row["Beta 2"] - row["Beta 4"]) ** 2 / (row["SE Beta 2"] ** 2 + row["SE Beta 4"] ** 2)
+        expected[row["Protein"]] = (stat_1, 1 - chi2.cdf(stat_1, df=1), stat_2, 1 - chi2.cdf(stat_2, df=1))
+
+    wald_df = compute_wald_test(results_df, adjust_p=False).set_index("Protein")
+
+    assert sorted(wald_df.index) == sorted(expected)
+    for protein, values in expected.items():
+        actual = wald_df.loc[protein, ["Wald Statistic 1", "P-value 1", "Wald Statistic 2", "P-value 2"]]
+        np.testing.assert_allclose(actual.to_numpy(dtype=float), values, rtol=1e-12, atol=1e-15)
+
+
+def test_compute_wald_test_adjusts_each_column_with_multipletests():
+    results_df = _slopes()
+    # Identical slopes in every row give all-equal p-values of 1 in the first family
+    results_df["Beta 3"] = results_df["Beta 1"]
+    results_df["SE Beta 3"] = results_df["SE Beta 1"]
+
+    wald_df = compute_wald_test(results_df)
+
+    for i in [1, 2]:
+        p_val = wald_df[f"P-value {i}"].to_numpy()
+        tested = ~np.isnan(p_val)
+        expected = np.full(len(p_val), np.nan)
+        expected[tested] = multipletests(p_val[tested], method="fdr_bh")[1]
+        np.testing.assert_array_equal(wald_df[f"Adjusted P-value {i}"].to_numpy(), expected)
+        np.testing.assert_array_equal(wald_df[f"Significant {i}"].to_numpy(), expected < 0.05)
+    assert np.isnan(wald_df.set_index("Protein").loc["P6", "P-value 1"])
+    assert wald_df["Rank"].tolist() == list(range(1, len(wald_df) + 1))
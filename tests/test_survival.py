@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from cplmm.survival import compute_event_df
+
+
+def _visits():
+    # Visits are deliberately out of age order within subjects
+    return pd.DataFrame({
+        "SUBID": [3, 1, 1, 2, 1, 2, 3, 4],
+        "PROCEDURE_AGE": [71.0, 66.0, 64.0, 70.5, 65.0, 69.0, 70.0, 80.0],
+        "ONSET_AGE": [68.0, 63.0, 62.0, 67.0, 62.5, 66.0, 67.5, 79.0],
+        "NfL": [2.5, 1.8, 0.4, 0.7, 1.2, 0.9, 0.3, np.nan],
+    })
+
+
+def test_compute_event_df_matches_per_subject_loop():
+    df = _visits()
+
+    expected = []
+    for subid, g in df.groupby("SUBID"):
+        g = g.sort_values("PROCEDURE_AGE")
+        onset_age = g["ONSET_AGE"].iloc[0]
+        crossed = g[g["NfL"] >= 1.0]
+        if not crossed.empty:
+            time, event = crossed["PROCEDURE_AGE"].iloc[0] - onset_age, 1
+        else:
+            time, event = g["PROCEDURE_AGE"].max() - onset_age, 0
+        expected.append({"SUBID": subid, "time": time, "event": event, "group": "MCI"})
+    expected = pd.DataFrame(expected)
+
+    result = compute_event_df(df, threshold=1.0, biomarker="NfL", group_label="MCI")
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)